@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from rest_framework.authtoken.models import Token
-from .models import Roles, UserRole
+from .models import Roles
 
 User = get_user_model()
 
@@ -50,6 +50,12 @@ class RoleSerializer(serializers.ModelSerializer):
         model = Roles
         fields = ['id', 'name', 'description']
 
+class MinimalUserSerializer(serializers.ModelSerializer):
+    """Just enough of a user to show who posted or liked something"""
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'profile_picture']
+
 class CustomUserSerializer(serializers.ModelSerializer):
     roles = serializers.SerializerMethodField()
     
@@ -66,5 +72,6 @@ class CustomUserSerializer(serializers.ModelSerializer):
         read_only_fields = ['date_joined']
 
     def get_roles(self, obj):
-        user_roles = UserRole.objects.filter(user=obj)
+        # Uses the prefetched user_roles when the queryset provides them
+        user_roles = obj.user_roles.all()
         return [user_role.role.name for user_role in user_roles]
\ No newline at end of file
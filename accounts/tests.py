@@ -1,3 +1,47 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
 
-# Create your tests here.
+User = get_user_model()
+
+
+class LoginViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='pass')
+        self.client = APIClient()
+        self.url = reverse('login')
+
+    def login(self, **data):
+        return self.client.post(self.url, data, format='json')
+
+    def test_missing_field(self):
+        response = self.login(email='user@example.com')
+        self.assertEqual(response.status_code, 400)
+        response = self.login(password='pass')
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_email(self):
+        response = self.login(email='nobody@example.com', password='pass')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Token.objects.exists())
+
+    def test_wrong_password(self):
+        response = self.login(email='user@example.com', password='wrong')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Token.objects.exists())
+
+    def test_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.login(email='user@example.com', password='pass')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Token.objects.exists())
+
+    def test_success(self):
+        response = self.login(email='user@example.com', password='pass')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['token'], Token.objects.get(user=self.user).key)
+        self.assertEqual(response.data['user_id'], self.user.id)
+        self.assertEqual(response.data['user.email'], 'user@example.com')
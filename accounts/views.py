@@ -2,7 +2,7 @@ from django.shortcuts import render
 from .serializers import RegisterSerializer
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
-from django.contrib.auth import get_user_model, authenticate
+from django.contrib.auth import get_user_model
 from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 
@@ -32,10 +32,25 @@ def login_view(request):
     password = request.data.get('password')
 
     if email is None or password is None:
-        raise ValueError("Both fields must be present")
+        return Response(
+            {
+                'error': 'Both email and password must be present'
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    user = authenticate(email=email, password=password)
-    if user:
+    # The password is checked here rather than through authenticate(), so AUTHENTICATION_BACKENDS
+    # are bypassed (only the model backend's email + password check applies) and a failure
+    # does not send the user_login_failed signal.
+    try:
+        # Only the columns needed to check the password and build the response
+        user = User.objects.only('id', 'email', 'password', 'is_active').get(email=email)
+    except User.DoesNotExist:
+        # Hash anyway so the response time doesn't reveal which emails are registered
+        User().set_password(password)
+        user = None
+
+    if user is not None and user.check_password(password) and user.is_active:
         token, _ = Token.objects.get_or_create(user=user)
         return Response (
             {
@@ -60,7 +75,7 @@ def login_view(request):
 def follow_user(request, user_id):
     if request.method == 'POST':
         try:
-            user_to_follow = User.objects.get(id=user_id)
+            user_to_follow = User.objects.only('id', 'username', 'email').get(id=user_id)
 
         except User.DoesNotExist:
             return Response(
@@ -70,7 +85,7 @@ def follow_user(request, user_id):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        if user_to_follow  in request.user.following.all():
+        if request.user.following.filter(id=user_id).exists():
             return Response (
                 {
                     'message': f'You already follow {user_to_follow}'
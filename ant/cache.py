@@ -0,0 +1,50 @@
+import hashlib
+from uuid import uuid4
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+
+def get_cache_version(version_key):
+    return cache.get_or_set(version_key, lambda: uuid4().hex, None)
+
+
+def bump_cache_version(version_key):
+    """
+    Invalidate everything cached under a version at once. Cached responses are keyed by
+    the version, so replacing it works on any cache backend without deleting keys by pattern.
+    """
+    cache.set(version_key, uuid4().hex, None)
+
+
+def bump_cache_version_on_commit(version_key):
+    # Wait for the commit so a concurrent request can't re-cache the old rows
+    transaction.on_commit(lambda: bump_cache_version(version_key))
+
+
+def request_cache_key(prefix, request, version_keys):
+    # The full URL covers the filters and the cursor, the user covers per-user fields
+    versions = ':'.join(get_cache_version(version_key) for version_key in version_keys)
+    user_id = request.user.id if request.user.is_authenticated else 'anon'
+    url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'{prefix}:{versions}:{user_id}:{url_hash}'
+
+
+class CachedListMixin:
+    """
+    Serves a list view's responses from the cache until one of its versions is bumped.
+    Views set cache_prefix, cache_timeout (in seconds) and get_cache_version_keys().
+    """
+    cache_prefix = None
+    cache_timeout = None
+
+    def get_cache_version_keys(self):
+        return []
+
+    def list(self, request, *args, **kwargs):
+        cache_key = request_cache_key(self.cache_prefix, request, self.get_cache_version_keys())
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, self.cache_timeout)
+        return Response(data)
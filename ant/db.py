@@ -0,0 +1,24 @@
+# Django compiles icontains to UPPER(column::text) LIKE UPPER(...) on PostgreSQL,
+# so the trigram indexes are built on that same expression to be usable by the planner.
+# Other backends have no pg_trgm and are left alone.
+
+
+def create_trigram_indexes(schema_editor, table, indexes):
+    """
+    Creates a GIN trigram index for each index name -> column in indexes on table.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, column in indexes.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} ON {table} '
+            f'USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(schema_editor, indexes):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index_name in indexes:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index_name}')
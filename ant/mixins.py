@@ -0,0 +1,28 @@
+class EagerLoadingMixin:
+    """
+    Runs the view's queryset through its serializer's setup_eager_loading(queryset, user),
+    so the nested fields the serializer reads for every row are fetched up front.
+    """
+    def get_queryset(self):
+        return self.get_serializer_class().setup_eager_loading(
+            super().get_queryset(), self.request.user
+        )
+
+
+class CounterFieldsMixin:
+    """
+    For models with denormalized counters that are only ever changed through F() updates.
+    Saving an existing row leaves the fields named in counter_fields out of the UPDATE,
+    so the copy loaded with the instance can't overwrite a change made since.
+    """
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
@@ -0,0 +1,82 @@
+import datetime
+import decimal
+import unittest
+import uuid
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.renderers import JSONRenderer
+from post.models import Post, Like
+from .renderers import ORJSONRenderer, orjson
+
+User = get_user_model()
+
+
+class CounterFieldsMixinTests(TestCase):
+    """
+    Saving a loaded instance must not write back its stale copy of a counter field.
+    """
+    def setUp(self):
+        self.author = User.objects.create_user(email='author@example.com', username='author', password='pass')
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='pass')
+        self.post = Post.objects.create(user=self.author, content='Hello')
+
+    def test_save_keeps_concurrent_count(self):
+        post = Post.objects.get(pk=self.post.pk)
+        # A like lands after the post was loaded for editing
+        Like.objects.create(post=self.post, user=self.user)
+        post.content = 'Hello again'
+        post.save()
+        saved = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(saved.likes_count, 1)
+        self.assertEqual(saved.content, 'Hello again')
+
+    def test_explicit_update_fields_still_written(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post.likes_count = 3
+        post.save(update_fields=['likes_count'])
+        self.assertEqual(Post.objects.get(pk=self.post.pk).likes_count, 3)
+
+
+@unittest.skipIf(orjson is None, 'orjson is not installed')
+class ORJSONRendererTests(SimpleTestCase):
+    """
+    ORJSONRenderer has to produce the same bytes as DRF's JSONRenderer.
+    """
+    def assertSameAsJSONRenderer(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_representative_payload(self):
+        self.assertSameAsJSONRenderer({
+            'next': 'http://testserver/api/events/?cursor=cD0yMDI2',
+            'previous': None,
+            'results': [
+                {
+                    'id': 1,
+                    'name': 'Café meetup 🎉',
+                    'description': 'Line\nbreak, "quotes", back\\slash and \u2028\u2029 separators',
+                    'start_time': datetime.datetime(2026, 10, 14, 4, 31, 5, 123456, tzinfo=datetime.timezone.utc),
+                    'day': datetime.date(2026, 10, 14),
+                    'at': datetime.time(9, 30),
+                    'is_virtual': False,
+                    'interested_count': 0,
+                    'price': 12.5,
+                    'fee': decimal.Decimal('3.25'),
+                    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+                    'organizer': {'id': 2, 'username': 'organizer', 'profile_picture': None},
+                    'tags': ['a', 'b'],
+                },
+            ],
+            7: 'non string key',
+        })
+
+    def test_integer_wider_than_64_bits_falls_back(self):
+        self.assertSameAsJSONRenderer({'big': 2 ** 70})
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_indented_output(self):
+        self.assertEqual(
+            ORJSONRenderer().render({'a': [1, 2]}, 'application/json; indent=4'),
+            JSONRenderer().render({'a': [1, 2]}, 'application/json; indent=4'),
+        )
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-14 04:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0003_rename_link_event_instagram_link_event_reg_link_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='event',
+            options={'ordering': ['-start_time', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-start_time', '-id'], name='event_event_start_t_9103a1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organizer', '-start_time', '-id'], name='event_event_organiz_5d6809_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_virtual', '-start_time', '-id'], name='event_event_is_virt_71eb5f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventinterest',
+            index=models.Index(fields=['event', 'user'], name='event_event_event_i_05d232_idx'),
+        ),
+    ]
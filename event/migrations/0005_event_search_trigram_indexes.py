@@ -0,0 +1,28 @@
+from django.db import migrations
+from ant.db import create_trigram_indexes, drop_trigram_indexes
+
+# See ant/db.py for why the indexes are built on UPPER(column::text)
+TRIGRAM_INDEXES = {
+    'event_event_name_trgm': 'name',
+    'event_event_description_trgm': 'description',
+    'event_event_location_trgm': 'location',
+}
+
+
+def create_indexes(apps, schema_editor):
+    create_trigram_indexes(schema_editor, 'event_event', TRIGRAM_INDEXES)
+
+
+def drop_indexes(apps, schema_editor):
+    drop_trigram_indexes(schema_editor, TRIGRAM_INDEXES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0004_alter_event_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
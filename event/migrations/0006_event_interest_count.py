@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-14 04:31
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_interest_count(apps, schema_editor):
+    Event = apps.get_model('event', 'Event')
+    EventInterest = apps.get_model('event', 'EventInterest')
+    counts = EventInterest.objects.filter(event=OuterRef('pk')).order_by().values('event').annotate(
+        count=Count('id')
+    ).values('count')
+    Event.objects.update(interest_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0005_event_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='interest_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_interest_count, migrations.RunPython.noop),
+    ]
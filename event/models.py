@@ -1,14 +1,57 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models import BooleanField, Exists, F, OuterRef, Q, Value
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from django.utils import timezone
 from accounts.models import Roles, UserRole
+from ant.cache import bump_cache_version_on_commit
+from ant.mixins import CounterFieldsMixin
 
 
 User = get_user_model()
 
+# Cached event lists are keyed by this version, event and interest changes bump it
+EVENT_LIST_VERSION_KEY = 'events:list:version'
+
+class EventQuerySet(models.QuerySet):
+    """
+    Chainable filters and annotations shared by the event views.
+    """
+    def with_interest_state(self, user):
+        """Annotate whether the given user is interested in each event"""
+        if user.is_authenticated:
+            is_interested = Exists(EventInterest.objects.filter(event=OuterRef('pk'), user=user))
+        else:
+            is_interested = Value(False, output_field=BooleanField())
+        return self.annotate(is_interested=is_interested)
+
+    def upcoming(self):
+        return self.filter(start_time__gt=timezone.now())
+
+    def past(self):
+        return self.filter(start_time__lt=timezone.now())
+
+    def organized_by(self, user):
+        return self.filter(organizer=user)
+
+    def interested_by(self, user):
+        # A subquery instead of a join keeps one row per event, so no distinct() is needed
+        return self.filter(Exists(EventInterest.objects.filter(event=OuterRef('pk'), user=user)))
+
+    def virtual(self, is_virtual=True):
+        return self.filter(is_virtual=is_virtual)
+
+    def text_search(self, query):
+        # On PostgreSQL these lookups are backed by the pg_trgm indexes (migration 0005)
+        return self.filter(
+            Q(name__icontains=query) |
+            Q(description__icontains=query) |
+            Q(location__icontains=query)
+        )
+
 # Create your models here.
-class Event(models.Model):
+class Event(CounterFieldsMixin, models.Model):
     name = models.CharField(max_length=150)
     description = models.TextField()
     start_time = models.DateTimeField()
@@ -21,17 +64,49 @@ class Event(models.Model):
     organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='events')
     reg_link = models.URLField(blank=True, null=True)
     instagram_link = models.URLField(blank=True, null=True)
+    # Denormalized count of EventInterest rows, kept in sync by the signals below
+    interest_count = models.PositiveIntegerField(default=0)
+
+    objects = EventQuerySet.as_manager()
+    counter_fields = ('interest_count',)
+
+    class Meta:
+        ordering = ['-start_time', '-id']
+        indexes = [
+            models.Index(fields=['-start_time', '-id']),
+            models.Index(fields=['organizer', '-start_time', '-id']),
+            models.Index(fields=['is_virtual', '-start_time', '-id']),
+        ]
 
     def __str__(self):
         return self.name
 
+# The organizer role is created once and never changes, so its id is cached per process
+_organizer_role_id = None
+
+def get_organizer_role_id():
+    if _organizer_role_id is not None:
+        return _organizer_role_id
+    organizer_role, created = Roles.objects.get_or_create(name='organizer')
+    # Only remember the id once the row is known to be committed, a rolled back
+    # transaction would otherwise leave the cache pointing at a missing role
+    transaction.on_commit(lambda: _set_organizer_role_id(organizer_role.id))
+    return organizer_role.id
+
+def _set_organizer_role_id(role_id):
+    global _organizer_role_id
+    _organizer_role_id = role_id
+
+@receiver(post_delete, sender=Roles)
+def forget_organizer_role(sender, instance, **kwargs):
+    if instance.id == _organizer_role_id:
+        _set_organizer_role_id(None)
+
 @receiver(post_save, sender=Event)
 def create_event(sender, instance, created, **kwargs):
     if created:
-        # Get or create the organizer role
-        organizer_role, created = Roles.objects.get_or_create(name='organizer')
         # Add the organizer role to the user if they don't already have it
-        UserRole.objects.get_or_create(user=instance.organizer, role=organizer_role)
+        UserRole.objects.get_or_create(user_id=instance.organizer_id, role_id=get_organizer_role_id())
 
 class EventInterest(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='interested_events')
@@ -40,7 +115,24 @@ class EventInterest(models.Model):
 
     class Meta:
         unique_together = ('user', 'event')
+        # unique_together already covers (user, event), this serves event-first lookups
+        indexes = [
+            models.Index(fields=['event', 'user']),
+        ]
 
     def __str__(self):
         return f'{self.user.email} is interested in {self.event.name}'
-    
+
+@receiver(post_save, sender=EventInterest)
+def increment_interest_count(sender, instance, created, **kwargs):
+    if created:
+        Event.objects.filter(pk=instance.event_id).update(interest_count=F('interest_count') + 1)
+
+@receiver(post_delete, sender=EventInterest)
+def decrement_interest_count(sender, instance, **kwargs):
+    Event.objects.filter(pk=instance.event_id).update(interest_count=F('interest_count') - 1)
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=EventInterest)
+def invalidate_event_lists(sender, **kwargs):
+    bump_cache_version_on_commit(EVENT_LIST_VERSION_KEY)
@@ -0,0 +1,23 @@
+from rest_framework.pagination import CursorPagination
+
+class EventCursorPagination(CursorPagination):
+    """
+    Cursor pagination for event lists, newest start time first.
+    Pages are fetched with an index seek on start_time instead of an OFFSET scan. The cursor
+    only positions on start_time, the id makes the order of events sharing one deterministic.
+    """
+    page_size = 25
+    ordering = ('-start_time', '-id')
+
+class UpcomingEventCursorPagination(EventCursorPagination):
+    """
+    Cursor pagination for upcoming events, soonest first.
+    """
+    ordering = ('start_time', 'id')
+
+class InterestedUserCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the users interested in an event, in id order.
+    """
+    page_size = 25
+    ordering = 'id'
@@ -5,7 +5,7 @@ from accounts.serializers import CustomUserSerializer
 class EventSerializer(serializers.ModelSerializer):
     organizer = CustomUserSerializer(read_only=True)
     is_organizer = serializers.SerializerMethodField()
-    interested_count = serializers.SerializerMethodField()
+    interested_count = serializers.IntegerField(source='interest_count', read_only=True)
     is_interested = serializers.SerializerMethodField()
 
     class Meta:
@@ -30,22 +30,40 @@ class EventSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at', 'organizer']
 
+    @staticmethod
+    def setup_eager_loading(queryset, user):
+        """
+        Load everything this serializer reads per event up front. Views build their
+        querysets through here, so new nested fields get their prefetch next to them.
+        """
+        # The nested organizer and the roles CustomUserSerializer lists for them
+        queryset = queryset.select_related('organizer').prefetch_related('organizer__user_roles__role')
+        # is_interested (interested_count is a column on Event)
+        return queryset.with_interest_state(user)
+
     def get_is_organizer(self, obj):
         request = self.context.get('request')
         if request and hasattr(request, 'user'):
             return request.user == obj.organizer
         return False
     
-    def get_interested_count(self, obj):
-        return obj.interests.count()
-    
     def get_is_interested(self, obj):
+        if hasattr(obj, 'is_interested'):
+            return obj.is_interested
         request = self.context.get('request')
-        if request and hasattr(request, 'user'):
+        if request and hasattr(request, 'user') and request.user.is_authenticated:
             return obj.interests.filter(user=request.user).exists()
         return False
 
     def create(self, validated_data):
         # Set the organizer as the current authenticated user
         validated_data['organizer'] = self.context['request'].user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+
+class EventListSerializer(EventSerializer):
+    """
+    Lighter EventSerializer for list endpoints, leaves out the description.
+    """
+    class Meta(EventSerializer.Meta):
+        fields = [field for field in EventSerializer.Meta.fields if field != 'description']
@@ -1,3 +1,207 @@
+import json
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from .models import Event, EventInterest
 
-# Create your tests here.
+User = get_user_model()
+
+
+class EventInterestCountTests(TestCase):
+    """
+    Event.interest_count is maintained by signals and by the bulk_create toggle path.
+    """
+    def setUp(self):
+        self.organizer = User.objects.create_user(email='organizer@example.com', username='organizer', password='pass')
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='pass')
+        self.event = Event.objects.create(
+            name='Meetup',
+            description='A meetup',
+            start_time=timezone.now(),
+            end_time=timezone.now() + timezone.timedelta(hours=2),
+            location='Nairobi',
+            image='events_image/meetup.jpg',
+            organizer=self.organizer,
+        )
+
+    def interest_count(self):
+        return Event.objects.values_list('interest_count', flat=True).get(pk=self.event.pk)
+
+    def test_adding_interest_increments_count(self):
+        EventInterest.objects.create(event=self.event, user=self.user)
+        self.assertEqual(self.interest_count(), 1)
+
+    def test_removing_interest_decrements_count(self):
+        interest = EventInterest.objects.create(event=self.event, user=self.user)
+        interest.delete()
+        self.assertEqual(self.interest_count(), 0)
+
+    def test_deleting_user_decrements_count(self):
+        EventInterest.objects.create(event=self.event, user=self.user)
+        EventInterest.objects.create(event=self.event, user=self.organizer)
+        self.user.delete()
+        self.assertEqual(self.interest_count(), 1)
+
+    def test_toggle_view_adds_and_removes_interest(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse('event-interest', args=[self.event.pk])
+
+        response = client.post(url)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['interest_count'], 1)
+        self.assertEqual(self.interest_count(), 1)
+
+        response = client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['interest_count'], 0)
+        self.assertEqual(self.interest_count(), 0)
+
+    def test_toggle_view_unknown_event(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(reverse('event-interest', args=[self.event.pk + 100]))
+        self.assertEqual(response.status_code, 404)
+
+
+class EventInterestedUsersTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(email='organizer@example.com', username='organizer', password='pass')
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='pass')
+        self.event = Event.objects.create(
+            name='Meetup',
+            description='A meetup',
+            start_time=timezone.now(),
+            end_time=timezone.now() + timezone.timedelta(hours=2),
+            location='Nairobi',
+            image='events_image/meetup.jpg',
+            organizer=self.organizer,
+        )
+        EventInterest.objects.create(event=self.event, user=self.user)
+        self.url = reverse('event-interested-users', args=[self.event.pk])
+
+    def test_requires_authentication(self):
+        response = APIClient().get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_lists_users_without_email(self):
+        client = APIClient()
+        client.force_authenticate(self.organizer)
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [
+            {'id': self.user.id, 'username': 'user', 'profile_picture': None},
+        ])
+
+
+class EventListPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_events_sharing_a_start_time_are_listed_newest_first(self):
+        organizer = User.objects.create_user(email='organizer@example.com', username='organizer', password='pass')
+        start_time = timezone.now()
+        events = [
+            Event.objects.create(
+                name=f'Meetup {i}',
+                description='A meetup',
+                start_time=start_time,
+                end_time=start_time + timezone.timedelta(hours=2),
+                location='Nairobi',
+                image='events_image/meetup.jpg',
+                organizer=organizer,
+            )
+            for i in range(3)
+        ]
+
+        response = APIClient().get(reverse('event-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [event['id'] for event in response.data['results']],
+            [event.id for event in reversed(events)],
+        )
+
+
+class EventListCacheTests(TestCase):
+    """
+    Cached event lists are invalidated by version bumps that only run once the change commits.
+    """
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email='organizer@example.com', username='organizer', password='pass')
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='pass')
+        self.event = Event.objects.create(
+            name='Meetup',
+            description='A meetup',
+            start_time=timezone.now(),
+            end_time=timezone.now() + timezone.timedelta(hours=2),
+            location='Nairobi',
+            image='events_image/meetup.jpg',
+            organizer=self.organizer,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def events(self):
+        response = self.client.get(reverse('event-list'))
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_repeat_request_is_served_from_cache(self):
+        self.events()
+        with self.assertNumQueries(0):
+            self.events()
+
+    def test_interest_toggle_invalidates_list(self):
+        url = reverse('event-interest', args=[self.event.pk])
+        self.assertEqual(self.events()[0]['interested_count'], 0)
+
+        # Adding goes through bulk_create, which bumps the version itself
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url)
+        event = self.events()[0]
+        self.assertEqual(event['interested_count'], 1)
+        self.assertTrue(event['is_interested'])
+
+        # Removing goes through the post_delete signal
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url)
+        event = self.events()[0]
+        self.assertEqual(event['interested_count'], 0)
+        self.assertFalse(event['is_interested'])
+
+
+class EventExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        organizer = User.objects.create_user(email='organizer@example.com', username='organizer', password='pass')
+        for i, is_virtual in enumerate([False, True, False]):
+            Event.objects.create(
+                name=f'Meetup {i}',
+                description='A meetup',
+                start_time=timezone.now() + timezone.timedelta(days=i),
+                end_time=timezone.now() + timezone.timedelta(days=i, hours=2),
+                location='Nairobi',
+                is_virtual=is_virtual,
+                image='events_image/meetup.jpg',
+                organizer=organizer,
+            )
+        self.client = APIClient()
+
+    def export(self, params=None):
+        response = self.client.get(reverse('event-export'), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_export_matches_list(self):
+        for params in [None, {'virtual': 'true'}, {'search': 'Meetup 2'}]:
+            with self.subTest(params=params):
+                listed = self.client.get(reverse('event-list'), params).json()['results']
+                self.assertEqual(self.export(params)['results'], listed)
+
+    def test_export_without_matches(self):
+        self.assertEqual(self.export({'search': 'nothing matches'}), {'results': []})
@@ -4,6 +4,7 @@ from . import views
 urlpatterns = [
     # CRUD operations
     path('events/', views.EventListView.as_view(), name='event-list'),
+    path('events/export/', views.EventExportView.as_view(), name='event-export'),
     path('events/create/', views.EventCreateView.as_view(), name='event-create'),
     path('events/<int:pk>/', views.EventRetrieveView.as_view(), name='event-detail'),
     path('events/<int:pk>/update/', views.EventUpdateView.as_view(), name='event-update'),
@@ -1,52 +1,89 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
+from django.contrib.auth import get_user_model
+from django.http import Http404, StreamingHttpResponse
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from django.db.models import Count, Q
-from django.utils import timezone
-from .models import Event, EventInterest
-from .serializers import EventSerializer
+from django.db import transaction
+from django.db.models import F
+from .models import Event, EventInterest, EVENT_LIST_VERSION_KEY
+from .serializers import EventSerializer, EventListSerializer
 from .permissions import IsOrganizerOrReadOnly
+from .pagination import EventCursorPagination, UpcomingEventCursorPagination, InterestedUserCursorPagination
+from accounts.serializers import MinimalUserSerializer
+from ant.mixins import EagerLoadingMixin
+from ant.cache import CachedListMixin, bump_cache_version_on_commit
+from ant.renderers import ORJSONRenderer
 
-class EventListView(generics.ListAPIView):
+User = get_user_model()
+
+class EventFilterMixin:
     """
-    View to list all events.
+    Filters the view's queryset by the event list query parameters: type, virtual and search.
     """
-    queryset = Event.objects.all().order_by('-start_time')
-    serializer_class = EventSerializer
-    permission_classes = [permissions.AllowAny]
-
     def get_queryset(self):
-        queryset = super().get_queryset().annotate(
-            interest_count=Count('interests')
-        )
+        queryset = super().get_queryset()
         
         event_type = self.request.query_params.get('type', None)
         is_virtual = self.request.query_params.get('virtual', None)
         search_query = self.request.query_params.get('search', None)
         
         if event_type:
-            now = timezone.now()
             if event_type == 'upcoming':
-                queryset = queryset.filter(start_time__gt=now)
+                queryset = queryset.upcoming()
             elif event_type == 'past':
-                queryset = queryset.filter(start_time__lt=now)
+                queryset = queryset.past()
             elif event_type == 'organized' and self.request.user.is_authenticated:
-                queryset = queryset.filter(organizer=self.request.user)
+                queryset = queryset.organized_by(self.request.user)
             elif event_type == 'interested' and self.request.user.is_authenticated:
-                queryset = queryset.filter(interests__user=self.request.user)
+                queryset = queryset.interested_by(self.request.user)
         
         if is_virtual is not None:
-            is_virtual = is_virtual.lower() == 'true'
-            queryset = queryset.filter(is_virtual=is_virtual)
+            queryset = queryset.virtual(is_virtual.lower() == 'true')
             
         if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(location__icontains=search_query)
-            )
+            queryset = queryset.text_search(search_query)
         
-        return queryset.distinct()
+        return queryset
+
+class EventListView(CachedListMixin, EventFilterMixin, EagerLoadingMixin, generics.ListAPIView):
+    """
+    View to list all events.
+    """
+    queryset = Event.objects.defer('description')
+    serializer_class = EventListSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = EventCursorPagination
+    # Repeat requests are served from the cache, any event or interest change invalidates it
+    cache_prefix = 'events:list'
+    cache_timeout = 45
+
+    def get_cache_version_keys(self):
+        return [EVENT_LIST_VERSION_KEY]
+
+class EventExportView(EventFilterMixin, EagerLoadingMixin, generics.ListAPIView):
+    """
+    View to stream all matching events as a single JSON array.
+    Takes the same filters as the event list but isn't paginated, rows are
+    serialized one at a time so memory stays flat however many events match.
+    """
+    queryset = Event.objects.defer('description')
+    serializer_class = EventListSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(self.stream_events(queryset), content_type='application/json')
+
+    def stream_events(self, queryset):
+        renderer = ORJSONRenderer()
+        serializer = self.get_serializer()
+        yield b'{"results":['
+        for index, event in enumerate(queryset.iterator(chunk_size=500)):
+            if index:
+                yield b','
+            yield renderer.render(serializer.to_representation(event))
+        yield b']}'
 
 class EventCreateView(generics.CreateAPIView):
     """
@@ -65,7 +102,7 @@ class EventCreateView(generics.CreateAPIView):
         response.data['message'] = 'Event created successfully'
         return response
 
-class EventRetrieveView(generics.RetrieveAPIView):
+class EventRetrieveView(EagerLoadingMixin, generics.RetrieveAPIView):
     """
     View to retrieve a single event.
     """
@@ -73,11 +110,6 @@ class EventRetrieveView(generics.RetrieveAPIView):
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        return super().get_queryset().annotate(
-            interest_count=Count('interests')
-        )
-
 class EventUpdateView(generics.UpdateAPIView):
     """
     View to update an event.
@@ -113,115 +145,83 @@ class EventInterestView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def create(self, request, *args, **kwargs):
-        event = get_object_or_404(Event, pk=self.kwargs.get('pk'))
-        
-        # Check if interest already exists
-        interest, created = EventInterest.objects.get_or_create(
-            event=event,
-            user=request.user
-        )
+        event_id = self.kwargs.get('pk')
         
-        if not created:
-            interest.delete()
-            message = 'Interest removed from event'
-            status_code = status.HTTP_200_OK
-        else:
-            message = 'Interest added to event'
-            status_code = status.HTTP_201_CREATED
+        with transaction.atomic():
+            # One query both checks the event exists and locks its counter for the toggle
+            interest_count = Event.objects.select_for_update().filter(pk=event_id).values_list(
+                'interest_count', flat=True
+            ).first()
+            if interest_count is None:
+                raise Http404
+            
+            # Removing an existing interest doubles as the "already interested" check
+            deleted, _ = EventInterest.objects.filter(
+                event_id=event_id,
+                user=request.user
+            ).delete()
+            
+            if deleted:
+                interest_count -= 1
+                message = 'Interest removed from event'
+                status_code = status.HTTP_200_OK
+            else:
+                # A single INSERT ... ON CONFLICT DO NOTHING, unique_together is the conflict target
+                EventInterest.objects.bulk_create(
+                    [EventInterest(event_id=event_id, user=request.user)],
+                    ignore_conflicts=True
+                )
+                # bulk_create() doesn't send post_save, so bump the counter here. The event row
+                # is locked above, so no other insert for this event can have slipped in.
+                Event.objects.filter(pk=event_id).update(interest_count=F('interest_count') + 1)
+                bump_cache_version_on_commit(EVENT_LIST_VERSION_KEY)
+                interest_count += 1
+                message = 'Interest added to event'
+                status_code = status.HTTP_201_CREATED
             
         return Response({
             'message': message,
-            'interest_count': event.interests.count()
+            'interest_count': interest_count
         }, status=status_code)
 
-class EventInterestedUsersView(generics.ListAPIView):
-    """
-    View to list users interested in an event.
-    """
-    serializer_class = EventSerializer
-    permission_classes = [permissions.IsAuthenticated]
-
-    def get_queryset(self):
-        event_id = self.kwargs.get('pk')
-        return EventInterest.objects.filter(event_id=event_id)
-
-    def get_queryset(self):
-        queryset = Event.objects.all().annotate(
-            interest_count=Count('interests')
-        )
-        
-        event_type = self.request.query_params.get('type', None)
-        is_virtual = self.request.query_params.get('virtual', None)
-        
-        if event_type:
-            now = timezone.now()
-            if event_type == 'upcoming':
-                queryset = queryset.filter(start_time__gt=now)
-            elif event_type == 'past':
-                queryset = queryset.filter(start_time__lt=now)
-            elif event_type == 'organized' and self.request.user.is_authenticated:
-                queryset = queryset.filter(organizer=self.request.user)
-            elif event_type == 'interested' and self.request.user.is_authenticated:
-                queryset = queryset.filter(interests__user=self.request.user)
-        
-        if is_virtual is not None:
-            is_virtual = is_virtual.lower() == 'true'
-            queryset = queryset.filter(is_virtual=is_virtual)
-        
-        return queryset.distinct()
-
-    def perform_create(self, serializer):
-        serializer.save(organizer=self.request.user)
-
-class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
-    """
-    get: Retrieve an event
-    put: Update an event
-    delete: Delete an event
-    """
-    queryset = Event.objects.all()
-    serializer_class = EventSerializer
-    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-
-    def get_queryset(self):
-        return Event.objects.annotate(interest_count=Count('interests'))
-
-
-
 class EventInterestedUsersView(generics.ListAPIView):
     """
     get: List users interested in an event
     """
-    serializer_class = EventSerializer
-    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    serializer_class = MinimalUserSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = InterestedUserCursorPagination
 
     def get_queryset(self):
         event_id = self.kwargs['pk']
-        return EventInterest.objects.filter(event_id=event_id)
+        # Join through the interests to the users directly, loading only what MinimalUserSerializer
+        # renders. Ordering is left to the paginator.
+        return User.objects.filter(interested_events__event_id=event_id).only(
+            'id', 'username', 'profile_picture'
+        )
 
-class UserEventsView(generics.ListAPIView):
+class UserEventsView(EagerLoadingMixin, generics.ListAPIView):
     """
     get: List events for a specific user
     """
-    serializer_class = EventSerializer
+    queryset = Event.objects.defer('description')
+    serializer_class = EventListSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = EventCursorPagination
 
     def get_queryset(self):
         user_id = self.kwargs['user_id']
-        return Event.objects.filter(organizer_id=user_id).annotate(
-            interest_count=Count('interests')
-        )
+        return super().get_queryset().filter(organizer_id=user_id)
 
-class UpcomingEventsView(generics.ListAPIView):
+class UpcomingEventsView(EagerLoadingMixin, generics.ListAPIView):
     """
     get: List upcoming events
     """
-    serializer_class = EventSerializer
+    queryset = Event.objects.defer('description')
+    serializer_class = EventListSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = UpcomingEventCursorPagination
 
     def get_queryset(self):
-        now = timezone.now()
-        return Event.objects.filter(start_time__gt=now).annotate(
-            interest_count=Count('interests')
-        ).order_by('start_time')
+        return super().get_queryset().upcoming()
 
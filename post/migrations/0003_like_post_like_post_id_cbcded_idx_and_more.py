@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-14 04:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0006_event_interest_count'),
+        ('post', '0002_alter_post_options_post_post_type_post_tagged_event_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['post', '-created_at'], name='post_like_post_id_cbcded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-created_at', '-id'], name='post_post_created_e7346e_idx'),
+        ),
+    ]
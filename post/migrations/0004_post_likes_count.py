@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-14 04:38
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_likes_count(apps, schema_editor):
+    Post = apps.get_model('post', 'Post')
+    Like = apps.get_model('post', 'Like')
+    counts = Like.objects.filter(post=OuterRef('pk')).order_by().values('post').annotate(
+        count=Count('id')
+    ).values('count')
+    Post.objects.update(likes_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0003_like_post_like_post_id_cbcded_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(backfill_likes_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+from ant.db import create_trigram_indexes, drop_trigram_indexes
+
+# See ant/db.py for why the index is built on UPPER(content::text)
+TRIGRAM_INDEXES = {
+    'post_post_content_trgm': 'content',
+}
+
+
+def create_indexes(apps, schema_editor):
+    create_trigram_indexes(schema_editor, 'post_post', TRIGRAM_INDEXES)
+
+
+def drop_indexes(apps, schema_editor):
+    drop_trigram_indexes(schema_editor, TRIGRAM_INDEXES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0004_post_likes_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
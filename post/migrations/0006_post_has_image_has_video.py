@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-14 04:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_media_flags(apps, schema_editor):
+    Post = apps.get_model('post', 'Post')
+    Post.objects.exclude(image='').exclude(image__isnull=True).update(has_image=True)
+    Post.objects.exclude(video='').exclude(video__isnull=True).update(has_video=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0006_event_interest_count'),
+        ('post', '0005_post_content_trigram_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='has_image',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='has_video',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(backfill_media_flags, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('has_image', True)), fields=['-created_at'], name='post_has_image_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('has_video', True)), fields=['-created_at'], name='post_has_video_idx'),
+        ),
+    ]
@@ -1,12 +1,30 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db.models import BooleanField, Exists, F, OuterRef, Q, Value
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
 from event.models import Event
+from ant.cache import bump_cache_version_on_commit
+from ant.mixins import CounterFieldsMixin
 import os
 
 # Create your models here.
 User = get_user_model()
 
+# Posts with at least this many likes count as popular in the feed
+FEED_POPULAR_LIKES = 5
+# Posts from the last this many days count as recent in the feed
+FEED_RECENT_DAYS = 7
+
+# Cached feeds are keyed by two versions. Post and like changes can reach anyone's feed
+# through the popular and recent posts and bump the global one, follows bump the user's.
+FEED_VERSION_KEY = 'posts:feed:version'
+
+def feed_user_version_key(user_id):
+    return f'posts:feed:version:{user_id}'
+
 def validate_video_extension(value):
     """Validate video file extensions"""
     valid_extensions = ['.mp4', '.mov', '.avi', '.wmv']
@@ -14,7 +32,59 @@ def validate_video_extension(value):
     if ext.lower() not in valid_extensions:
         raise ValidationError('Unsupported video format. Please use MP4, MOV, AVI, or WMV.')
 
-class Post(models.Model):
+def _follows_author(user):
+    """Whether the given user follows the author of the outer post"""
+    # In the followers table from_customuser is the followed user, to_customuser the follower
+    follows = User.followers.through.objects.filter(
+        from_customuser=OuterRef('user_id'),
+        to_customuser=user,
+    )
+    return Exists(follows)
+
+class PostQuerySet(models.QuerySet):
+    """
+    Chainable filters and annotations shared by the post views.
+    """
+    def with_like_state(self, user):
+        """Annotate whether the given user has liked each post"""
+        if user.is_authenticated:
+            is_liked = Exists(Like.objects.filter(post=OuterRef('pk'), user=user))
+        else:
+            is_liked = Value(False, output_field=BooleanField())
+        return self.annotate(is_liked=is_liked)
+
+    def liked_by(self, user):
+        # A subquery instead of a join keeps one row per post, so no distinct() is needed
+        return self.filter(Exists(Like.objects.filter(post=OuterRef('pk'), user=user)))
+
+    def followed_by(self, user):
+        # A semi-join on the follow table, the followed ids are never pulled into Python
+        return self.filter(_follows_author(user))
+
+    def with_media(self, media_type):
+        # The flags are set by Post.save() and backed by partial indexes
+        if media_type == 'image':
+            return self.filter(has_image=True)
+        if media_type == 'video':
+            return self.filter(has_video=True)
+        if media_type == 'any':
+            return self.filter(Q(has_image=True) | Q(has_video=True))
+        return self
+
+    def text_search(self, query):
+        # On PostgreSQL this lookup is backed by the pg_trgm index (migration 0005)
+        return self.filter(content__icontains=query)
+
+    def feed(self, user):
+        """Posts from followed users, popular posts and recent posts"""
+        # A single scan with OR'd conditions, each post appears once without a union
+        return self.filter(
+            Q(_follows_author(user)) |
+            Q(likes_count__gte=FEED_POPULAR_LIKES) |
+            Q(created_at__gte=timezone.now() - timezone.timedelta(days=FEED_RECENT_DAYS))
+        )
+
+class Post(CounterFieldsMixin, models.Model):
     POST_TYPES = [
         ('text', 'Text Only'),
         ('image', 'Image'),
@@ -44,9 +114,16 @@ class Post(models.Model):
         blank=True,
         related_name='tagged_posts'
     )
+    likes_count = models.PositiveIntegerField(default=0, db_index=True)
+    # Kept in step with image/video by save(), so the media filters can use an index
+    has_image = models.BooleanField(default=False, editable=False)
+    has_video = models.BooleanField(default=False, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PostQuerySet.as_manager()
+    counter_fields = ('likes_count',)
+
     def clean(self):
         """Validate post content based on type"""
         if not self.content and not self.image and not self.video:
@@ -66,6 +143,8 @@ class Post(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()
+        self.has_image = bool(self.image)
+        self.has_video = bool(self.video)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -73,6 +152,12 @@ class Post(models.Model):
         
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            # Partial indexes, only media posts are in them
+            models.Index(fields=['-created_at'], condition=Q(has_image=True), name='post_has_image_idx'),
+            models.Index(fields=['-created_at'], condition=Q(has_video=True), name='post_has_video_idx'),
+        ]
 
 
 class Like(models.Model):
@@ -82,6 +167,40 @@ class Like(models.Model):
 
     class Meta:
         unique_together = ('user', 'post')
+        indexes = [
+            models.Index(fields=['post', '-created_at']),
+        ]
 
     def __str__(self):
-        return f"{self.user.email} liked post #{self.post.id} on {self.created_at}"
\ No newline at end of file
+        return f"{self.user.email} liked post #{self.post.id} on {self.created_at}"
+
+@receiver(post_save, sender=Like)
+def increment_likes_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(likes_count=F('likes_count') + 1)
+
+@receiver(post_delete, sender=Like)
+def decrement_likes_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id).update(likes_count=F('likes_count') - 1)
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Like)
+def invalidate_feeds(sender, **kwargs):
+    bump_cache_version_on_commit(FEED_VERSION_KEY)
+
+@receiver(m2m_changed, sender=User.followers.through)
+def invalidate_follower_feeds(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # user.following.add()/remove(), the instance is the follower
+        follower_ids = [instance.pk]
+    elif pk_set is not None:
+        # user.followers.add()/remove(), pk_set holds the followers
+        follower_ids = pk_set
+    else:
+        # user.followers.clear() doesn't say whose feeds changed
+        bump_cache_version_on_commit(FEED_VERSION_KEY)
+        return
+    for follower_id in follower_ids:
+        bump_cache_version_on_commit(feed_user_version_key(follower_id))
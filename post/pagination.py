@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+class PostCursorPagination(CursorPagination):
+    """
+    Cursor pagination on created_at, newest first, so deep pages cost the same as the
+    first. The id keeps the order of rows created at the same moment deterministic.
+    Also used for likes, which carry the same created_at field.
+    """
+    page_size = 20
+    ordering = ('-created_at', '-id')
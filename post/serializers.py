@@ -1,11 +1,19 @@
 from rest_framework import serializers
+from django.db.models import Prefetch
+from django.db.models.functions import Substr
 from .models import Post, Like
-from accounts.serializers import CustomUserSerializer
+from accounts.serializers import MinimalUserSerializer
 from event.serializers import EventSerializer
 from event.models import Event
 
+# Largest video a post may carry
+MAX_VIDEO_SIZE = 100 * 1024 * 1024  # 100MB in bytes
+
+# How much of a post's text a feed card shows
+FEED_PREVIEW_LENGTH = 280
+
 class LikeSerializer(serializers.ModelSerializer):
-    user = CustomUserSerializer(read_only=True)
+    user = MinimalUserSerializer(read_only=True)
     
     class Meta:
         model = Like
@@ -13,11 +21,9 @@ class LikeSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at']
 
 class PostSerializer(serializers.ModelSerializer):
-    user = CustomUserSerializer(read_only=True)
-    likes_count = serializers.SerializerMethodField()
+    user = MinimalUserSerializer(read_only=True)
     is_liked = serializers.SerializerMethodField()
     post_type = serializers.CharField(read_only=True)
-    likes = LikeSerializer(many=True, read_only=True)
     tagged_event = EventSerializer(read_only=True)
     tagged_event_id = serializers.PrimaryKeyRelatedField(
         queryset=Event.objects.all(),
@@ -40,16 +46,31 @@ class PostSerializer(serializers.ModelSerializer):
             'updated_at',
             'likes_count',
             'is_liked',
-            'likes',
             'tagged_event',
             'tagged_event_id'
         ]
-        read_only_fields = ['created_at', 'updated_at', 'user', 'post_type']
+        read_only_fields = ['created_at', 'updated_at', 'user', 'post_type', 'likes_count']
 
-    def get_likes_count(self, obj):
-        return obj.likes.count()
+    @staticmethod
+    def setup_eager_loading(queryset, user):
+        """
+        Load the author and tagged event every post renders in one batch
+        per relation, instead of one query per post.
+        """
+        # The author, and only the post and author columns the serializer renders
+        queryset = queryset.select_related('user').only(
+            'id', 'content', 'image', 'video', 'post_type', 'created_at', 'updated_at',
+            'likes_count', 'tagged_event', 'user', 'user__id', 'user__username', 'user__profile_picture'
+        )
+        # The tagged event, prepared the way EventSerializer expects
+        tagged_events = EventSerializer.setup_eager_loading(Event.objects.all(), user)
+        queryset = queryset.prefetch_related(Prefetch('tagged_event', queryset=tagged_events))
+        # is_liked
+        return queryset.with_like_state(user)
 
     def get_is_liked(self, obj):
+        if hasattr(obj, 'is_liked'):
+            return obj.is_liked
         request = self.context.get('request')
         if request and hasattr(request, 'user') and request.user.is_authenticated:
             return obj.likes.filter(user=request.user).exists()
@@ -68,9 +89,10 @@ class PostSerializer(serializers.ModelSerializer):
                 "Post must contain at least one of: text content, image, or video"
             )
 
-        # Check video file size (limit to 100MB)
+        # Check video file size (limit to 100MB). size comes from the upload handler,
+        # so this doesn't read the file.
         if video:
-            if video.size > 100 * 1024 * 1024:  # 100MB in bytes
+            if video.size > MAX_VIDEO_SIZE:
                 raise serializers.ValidationError(
                     "Video file size must not exceed 100MB"
                 )
@@ -80,4 +102,22 @@ class PostSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         # Set the user from the request
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+class PostFeedSerializer(PostSerializer):
+    """
+    Posts as feed cards, with the content cut down to a preview.
+    """
+    content = serializers.SerializerMethodField()
+
+    @staticmethod
+    def setup_eager_loading(queryset, user):
+        # The preview is cut in the database, so the full text is never loaded
+        return PostSerializer.setup_eager_loading(queryset, user).defer('content').annotate(
+            content_preview=Substr('content', 1, FEED_PREVIEW_LENGTH)
+        )
+
+    def get_content(self, obj):
+        if hasattr(obj, 'content_preview'):
+            return obj.content_preview
+        return obj.content[:FEED_PREVIEW_LENGTH] if obj.content else obj.content
@@ -1,3 +1,202 @@
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from ant.cache import get_cache_version
+from .models import Post, Like, FEED_POPULAR_LIKES, FEED_VERSION_KEY, feed_user_version_key
+from .serializers import PostSerializer
+from .views import MAX_UPLOAD_SIZE
 
-# Create your tests here.
+User = get_user_model()
+
+
+class PostLikeViewTests(TestCase):
+    """
+    The like toggle keeps Post.likes_count in step through the Like signals.
+    """
+    def setUp(self):
+        self.author = User.objects.create_user(email='author@example.com', username='author', password='pass')
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='pass')
+        self.post = Post.objects.create(user=self.author, content='Hello')
+
+    def likes_count(self):
+        return Post.objects.values_list('likes_count', flat=True).get(pk=self.post.pk)
+
+    def test_toggle_view_adds_and_removes_like(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse('post-like', args=[self.post.pk])
+
+        response = client.post(url)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['likes_count'], 1)
+        self.assertEqual(self.likes_count(), 1)
+        self.assertTrue(Like.objects.filter(post=self.post, user=self.user).exists())
+
+        response = client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['likes_count'], 0)
+        self.assertEqual(self.likes_count(), 0)
+        self.assertFalse(Like.objects.filter(post=self.post).exists())
+
+    def test_toggle_view_unknown_post(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(reverse('post-like', args=[self.post.pk + 100]))
+        self.assertEqual(response.status_code, 404)
+
+
+class PostFollowingTests(TestCase):
+    """
+    The followed-author filter behind ?type=following and the feed. The follow table's
+    from/to columns are easy to get backwards, so both ways of following are covered.
+    """
+    def setUp(self):
+        cache.clear()
+        self.viewer = User.objects.create_user(email='viewer@example.com', username='viewer', password='pass')
+        self.followed = User.objects.create_user(email='followed@example.com', username='followed', password='pass')
+        self.stranger = User.objects.create_user(email='stranger@example.com', username='stranger', password='pass')
+        month_ago = timezone.now() - timezone.timedelta(days=30)
+
+        self.old_followed = Post.objects.create(user=self.followed, content='Old post by a followed user')
+        self.old_popular = Post.objects.create(user=self.stranger, content='Old popular post')
+        self.old_unfollowed = Post.objects.create(user=self.stranger, content='Old post nobody follows')
+        Post.objects.filter(pk__in=[self.old_followed.pk, self.old_popular.pk, self.old_unfollowed.pk]).update(
+            created_at=month_ago
+        )
+        Post.objects.filter(pk=self.old_popular.pk).update(likes_count=FEED_POPULAR_LIKES)
+        self.recent = Post.objects.create(user=self.stranger, content='Recent post')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def follow_ways(self):
+        return [
+            ('following.add', lambda: self.viewer.following.add(self.followed)),
+            ('followers.add', lambda: self.followed.followers.add(self.viewer)),
+        ]
+
+    def test_following_filter(self):
+        for name, follow in self.follow_ways():
+            with self.subTest(name):
+                self.viewer.following.clear()
+                follow()
+                response = self.client.get(reverse('post-list'), {'type': 'following'})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([post['id'] for post in response.data['results']], [self.old_followed.pk])
+
+    def test_following_filter_without_follows(self):
+        response = self.client.get(reverse('post-list'), {'type': 'following'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_feed(self):
+        for name, follow in self.follow_ways():
+            with self.subTest(name):
+                self.viewer.following.clear()
+                follow()
+                feed = Post.objects.feed(self.viewer)
+                self.assertCountEqual(
+                    feed.values_list('pk', flat=True),
+                    [self.old_followed.pk, self.old_popular.pk, self.recent.pk],
+                )
+
+    def test_feed_view(self):
+        self.viewer.following.add(self.followed)
+        response = self.client.get(reverse('post-feed'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [post['id'] for post in response.data['results']],
+            [self.recent.pk, self.old_popular.pk, self.old_followed.pk],
+        )
+
+
+class PostFeedCacheTests(TestCase):
+    """
+    Cached feeds are invalidated by version bumps that only run once the change commits.
+    """
+    def setUp(self):
+        cache.clear()
+        self.viewer = User.objects.create_user(email='viewer@example.com', username='viewer', password='pass')
+        self.author = User.objects.create_user(email='author@example.com', username='author', password='pass')
+        self.post = Post.objects.create(user=self.author, content='Hello')
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def feed(self):
+        response = self.client.get(reverse('post-feed'))
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_repeat_request_is_served_from_cache(self):
+        self.feed()
+        with self.assertNumQueries(0):
+            self.feed()
+
+    def test_like_invalidates_feed(self):
+        self.assertEqual(self.feed()[0]['likes_count'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('post-like', args=[self.post.pk]))
+        self.assertEqual(self.feed()[0]['likes_count'], 1)
+
+    def test_follow_invalidates_followers_feed(self):
+        old_post = Post.objects.create(user=self.author, content='Old post')
+        Post.objects.filter(pk=old_post.pk).update(created_at=timezone.now() - timezone.timedelta(days=30))
+        self.assertNotIn(old_post.pk, [post['id'] for post in self.feed()])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('follow_user', args=[self.author.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(old_post.pk, [post['id'] for post in self.feed()])
+
+    def test_follow_change_bumps_only_the_followers_version(self):
+        global_version = get_cache_version(FEED_VERSION_KEY)
+        author_version = get_cache_version(feed_user_version_key(self.author.pk))
+        viewer_version = get_cache_version(feed_user_version_key(self.viewer.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.followers.add(self.viewer)
+
+        self.assertEqual(get_cache_version(FEED_VERSION_KEY), global_version)
+        self.assertEqual(get_cache_version(feed_user_version_key(self.author.pk)), author_version)
+        self.assertNotEqual(get_cache_version(feed_user_version_key(self.viewer.pk)), viewer_version)
+
+    def test_clearing_followers_bumps_global_version(self):
+        self.author.followers.add(self.viewer)
+        global_version = get_cache_version(FEED_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.followers.clear()
+        self.assertNotEqual(get_cache_version(FEED_VERSION_KEY), global_version)
+
+    def test_version_is_not_bumped_before_commit(self):
+        global_version = get_cache_version(FEED_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Like.objects.create(post=self.post, user=self.viewer)
+        self.assertEqual(get_cache_version(FEED_VERSION_KEY), global_version)
+        self.assertTrue(callbacks)
+
+
+class PostUploadSizeLimitTests(TestCase):
+    """
+    Oversized uploads are refused from Content-Length, before the body is parsed or validated.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_oversized_upload_is_rejected_before_validation(self):
+        with mock.patch.object(PostSerializer, 'is_valid') as is_valid:
+            response = self.client.post(
+                reverse('post-create'), {'content': 'Hello'}, CONTENT_LENGTH=str(MAX_UPLOAD_SIZE + 1),
+            )
+        self.assertEqual(response.status_code, 413)
+        is_valid.assert_not_called()
+        self.assertFalse(Post.objects.exists())
+
+    def test_upload_within_limit_is_created(self):
+        response = self.client.post(reverse('post-create'), {'content': 'Hello'})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Post.objects.filter(user=self.user, content='Hello').exists())
@@ -1,20 +1,47 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
 from rest_framework import generics, permissions, status, mixins
 from rest_framework.response import Response
-from django.db.models import Count, Q
-from django.utils import timezone
-from .models import Post, Like
-from .serializers import PostSerializer
+from rest_framework.exceptions import APIException
+from django.db import transaction
+from django.http import Http404
+from .models import Post, Like, FEED_VERSION_KEY, feed_user_version_key
+from .serializers import PostSerializer, PostFeedSerializer, LikeSerializer, MAX_VIDEO_SIZE
 from .permissions import IsAuthorOrReadOnly
+from .pagination import PostCursorPagination
+from ant.mixins import EagerLoadingMixin
+from ant.cache import CachedListMixin
 
-class PostListView(generics.ListCreateAPIView):
+# The largest video plus headroom for an image and the other form fields
+MAX_UPLOAD_SIZE = MAX_VIDEO_SIZE + 10 * 1024 * 1024
+
+class RequestTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Request body is too large.'
+    default_code = 'request_too_large'
+
+class UploadSizeLimitMixin:
+    """
+    Rejects oversized uploads from the Content-Length header, before the body is parsed.
+    """
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in ('POST', 'PUT', 'PATCH'):
+            try:
+                content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                content_length = 0
+            if content_length > MAX_UPLOAD_SIZE:
+                raise RequestTooLarge()
+
+class PostListView(UploadSizeLimitMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     """
     View to list all posts and create new posts.
     GET: List all posts
     POST: Create a new post (requires authentication)
     """
-    queryset = Post.objects.all().order_by('-created_at')
+    queryset = Post.objects.all()
     serializer_class = PostSerializer
+    pagination_class = PostCursorPagination
     
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -25,9 +52,7 @@ class PostListView(generics.ListCreateAPIView):
         serializer.save(user=self.request.user)
 
     def get_queryset(self):
-        queryset = super().get_queryset().annotate(
-            likes_count=Count('likes')
-        )
+        queryset = super().get_queryset()
 
         post_type = self.request.query_params.get('type', None)
         user_id = self.request.query_params.get('user', None)
@@ -37,9 +62,9 @@ class PostListView(generics.ListCreateAPIView):
         # Filter by post type
         if post_type:
             if post_type == 'following' and self.request.user.is_authenticated:
-                queryset = queryset.filter(user__in=self.request.user.following.all())
+                queryset = queryset.followed_by(self.request.user)
             elif post_type == 'liked' and self.request.user.is_authenticated:
-                queryset = queryset.filter(likes__user=self.request.user)
+                queryset = queryset.liked_by(self.request.user)
 
         # Filter by user
         if user_id:
@@ -47,23 +72,16 @@ class PostListView(generics.ListCreateAPIView):
 
         # Filter by media type
         if media_type:
-            if media_type == 'image':
-                queryset = queryset.exclude(image='')
-            elif media_type == 'video':
-                queryset = queryset.exclude(video='')
-            elif media_type == 'any':
-                queryset = queryset.filter(
-                    Q(image__isnull=False) | Q(video__isnull=False)
-                )
+            queryset = queryset.with_media(media_type)
 
         # Apply search filter
         if search_query:
-            queryset = queryset.filter(content__icontains=search_query)
+            queryset = queryset.text_search(search_query)
 
-        return queryset.distinct()
+        return queryset
 
 
-class PostCreateView(generics.CreateAPIView):
+class PostCreateView(UploadSizeLimitMixin, generics.CreateAPIView):
     """
     View to create a new post.
     """
@@ -80,7 +98,7 @@ class PostCreateView(generics.CreateAPIView):
         response.data['message'] = 'Post created successfully'
         return response
 
-class PostRetrieveView(generics.RetrieveAPIView):
+class PostRetrieveView(EagerLoadingMixin, generics.RetrieveAPIView):
     """
     View to retrieve a single post.
     """
@@ -88,12 +106,7 @@ class PostRetrieveView(generics.RetrieveAPIView):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        return super().get_queryset().annotate(
-            likes_count=Count('likes')
-        )
-
-class PostUpdateView(generics.UpdateAPIView):
+class PostUpdateView(UploadSizeLimitMixin, generics.UpdateAPIView):
     """
     View to update a post.
     """
@@ -128,39 +141,48 @@ class PostLikeView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def create(self, request, *args, **kwargs):
-        post = get_object_or_404(Post, pk=self.kwargs.get('pk'))
-        
-        # Check if like already exists
-        like, created = Like.objects.get_or_create(
-            post=post,
-            user=request.user
-        )
+        post_id = self.kwargs.get('pk')
         
-        if not created:
-            like.delete()
-            message = 'Post unliked successfully'
-            status_code = status.HTTP_200_OK
-        else:
-            message = 'Post liked successfully'
-            status_code = status.HTTP_201_CREATED
+        with transaction.atomic():
+            # Lock the post while toggling, the counter read here is returned adjusted by one
+            likes_count = Post.objects.select_for_update().filter(pk=post_id).values_list(
+                'likes_count', flat=True
+            ).first()
+            if likes_count is None:
+                raise Http404
+            
+            deleted, _ = Like.objects.filter(post_id=post_id, user=request.user).delete()
+            
+            if deleted:
+                likes_count -= 1
+                message = 'Post unliked successfully'
+                status_code = status.HTTP_200_OK
+            else:
+                # The Like signals bump likes_count and invalidate the cached feeds
+                Like.objects.create(post_id=post_id, user=request.user)
+                likes_count += 1
+                message = 'Post liked successfully'
+                status_code = status.HTTP_201_CREATED
             
         return Response({
             'message': message,
-            'likes_count': post.likes.count()
+            'likes_count': likes_count
         }, status=status_code)
 
 class PostLikersView(generics.ListAPIView):
     """
     View to list users who liked a post.
     """
-    serializer_class = PostSerializer
+    serializer_class = LikeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PostCursorPagination
 
     def get_queryset(self):
         post_id = self.kwargs.get('pk')
-        return Like.objects.filter(post_id=post_id).order_by('-created_at')
+        # The liker comes in the same query, ordering is left to the paginator
+        return Like.objects.select_related('user').filter(post_id=post_id)
 
-class PostFeedView(generics.ListAPIView):
+class PostFeedView(CachedListMixin, EagerLoadingMixin, generics.ListAPIView):
     """
     View to get personalized feed for authenticated user.
     Includes:
@@ -168,28 +190,16 @@ class PostFeedView(generics.ListAPIView):
     - Popular posts (high like count)
     - Recent posts
     """
-    serializer_class = PostSerializer
+    queryset = Post.objects.all()
+    serializer_class = PostFeedSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PostCursorPagination
+    # Repeat requests are served from the cache, post, like and follow changes invalidate it
+    cache_prefix = 'posts:feed'
+    cache_timeout = 30
 
     def get_queryset(self):
-        # Get posts from followed users
-        following_posts = Post.objects.filter(
-            user__in=self.request.user.following.all()
-        )
-
-        # Get popular posts (more than 5 likes)
-        popular_posts = Post.objects.annotate(
-            likes_count=Count('likes')
-        ).filter(likes_count__gte=5)
-
-        # Get recent posts
-        recent_posts = Post.objects.filter(
-            created_at__gte=timezone.now() - timezone.timedelta(days=7)
-        )
-
-        # Combine and remove duplicates
-        feed_posts = following_posts.union(
-            popular_posts, recent_posts
-        ).order_by('-created_at')
-
-        return feed_posts
+        return super().get_queryset().feed(self.request.user)
+
+    def get_cache_version_keys(self):
+        return [FEED_VERSION_KEY, feed_user_version_key(self.request.user.id)]